@@ -12,13 +12,42 @@ This writes:
 from __future__ import annotations
 
 import argparse
+import os
 from pathlib import Path
+from typing import Iterator
 
 
 def ensure_dir(path: Path) -> None:
     path.mkdir(parents=True, exist_ok=True)
 
 
+def iter_files(root: Path) -> Iterator[Path]:
+    # Like the old glob("**/*"), symlinked directories are not descended into (avoids loops and duplicates)
+    with os.scandir(root) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                yield from iter_files(Path(entry.path))
+            elif entry.is_file():
+                yield Path(entry.path)
+
+
+def collect_assets(assets_dir: Path) -> tuple[list[Path], list[Path]]:
+    # Single walk classifying files by suffix, instead of one glob pass per extension
+    css_files: list[Path] = []
+    js_files: list[Path] = []
+    if not assets_dir.is_dir():
+        return css_files, js_files
+    for path in iter_files(assets_dir):
+        suffix = path.suffix.lower()
+        if suffix == ".css":
+            css_files.append(path)
+        elif suffix == ".js":
+            js_files.append(path)
+    css_files.sort()
+    js_files.sort()
+    return css_files, js_files
+
+
 def main() -> int:
     parser = argparse.ArgumentParser(description="Generate Jinja include files from local assets")
     parser.add_argument("--assets-dir", type=Path, default=Path("site/assets"), help="Directory with local CSS/JS assets")
@@ -27,8 +56,7 @@ def main() -> int:
     parser.add_argument("--footer-template", type=str, default="_footer_includes.html", help="Footer partial filename")
     args = parser.parse_args()
 
-    css_files = sorted([p for p in args.assets_dir.glob("**/*.css") if p.is_file()])
-    js_files = sorted([p for p in args.assets_dir.glob("**/*.js") if p.is_file()])
+    css_files, js_files = collect_assets(args.assets_dir)
 
     head_lines: list[str] = []
     for css in css_files:
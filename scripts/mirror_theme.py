@@ -11,15 +11,36 @@ Outputs:
 from __future__ import annotations
 
 import argparse
+import hashlib
+import json
 import os
 import re
 from pathlib import Path
+from typing import Optional
 from urllib.parse import urljoin, urlparse
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from bs4 import BeautifulSoup
 
 
+def _build_session() -> requests.Session:
+    # One pooled session per run keeps connections alive across assets on the same host
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=16,
+        pool_maxsize=32,
+        max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504]),
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+_SESSION = _build_session()
+
+
 def ensure_dir(path: Path) -> None:
     path.mkdir(parents=True, exist_ok=True)
 
@@ -32,15 +53,92 @@ def safe_name_from_url(url: str) -> str:
     return name
 
 
-def download(url: str, target: Path) -> bool:
+HTTP_CACHE_FILENAME = ".http_cache.json"
+CHUNK_SIZE = 64 * 1024
+
+
+def write_stream(resp: requests.Response, target: Path) -> str:
+    # Write via a .part file so an interrupted transfer never leaves a truncated asset behind
+    part = target.with_name(target.name + ".part")
+    digest = hashlib.sha256()
+    try:
+        with open(part, "wb") as fh:
+            for chunk in resp.iter_content(CHUNK_SIZE):
+                digest.update(chunk)
+                fh.write(chunk)
+        part.replace(target)
+    finally:
+        part.unlink(missing_ok=True)
+    return digest.hexdigest()
+
+
+def load_cache(path: Path) -> dict:
     try:
-        resp = requests.get(url, timeout=30)
-        resp.raise_for_status()
-        ensure_dir(target.parent)
-        target.write_bytes(resp.content)
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def save_cache(path: Path, data: dict) -> None:
+    ensure_dir(path.parent)
+    path.write_text(json.dumps(data, indent=2, sort_keys=True), encoding="utf-8")
+
+
+def download(url: str, target: Path, http_cache: Optional[dict] = None) -> bool:
+    # http_cache maps url -> {"etag", "last_modified", "sha256"} and is updated in place
+    http_cache = {} if http_cache is None else http_cache
+    have_copy = target.exists() and target.stat().st_size > 0
+    validators = http_cache.get(url) if have_copy else None
+    if have_copy and not validators:
+        return True
+
+    headers = {}
+    if validators:
+        # Conditional GET: an unchanged asset comes back as a bodiless 304
+        if validators.get("etag"):
+            headers["If-None-Match"] = validators["etag"]
+        if validators.get("last_modified"):
+            headers["If-Modified-Since"] = validators["last_modified"]
+    try:
+        with _SESSION.get(url, headers=headers, stream=True, timeout=30) as resp:
+            if resp.status_code == 304 and have_copy:
+                return True
+            resp.raise_for_status()
+            ensure_dir(target.parent)
+            sha = write_stream(resp, target)
+            etag = resp.headers.get("ETag")
+            last_modified = resp.headers.get("Last-Modified")
+        if etag or last_modified:
+            http_cache[url] = {"etag": etag, "last_modified": last_modified, "sha256": sha}
+        else:
+            http_cache.pop(url, None)
         return True
     except Exception:
-        return False
+        # A failed revalidation still leaves a usable local copy
+        return have_copy
+
+
+# Attributes replicated onto the generated tags, in output order
+_LINK_ATTRS = ("rel", "as", "type", "crossorigin", "media", "integrity", "referrerpolicy")
+_SCRIPT_ATTRS = ("type", "crossorigin", "defer", "async", "integrity", "referrerpolicy")
+
+
+def link_attrs(tag) -> str:
+    attrs = tag.attrs
+    return " ".join(
+        f'{k}="{" ".join(v) if isinstance(v, list) else v}"'
+        for k, v in ((k, attrs.get(k)) for k in _LINK_ATTRS)
+        if v
+    )
+
+
+def script_tag(tag, src: str) -> str:
+    attrs = tag.attrs
+    parts = [k if attrs[k] is True or attrs[k] is None else f'{k}="{attrs[k]}"' for k in _SCRIPT_ATTRS if k in attrs]
+    if parts:
+        return f'<script src="{src}" {" ".join(parts)}></script>'
+    return f'<script src="{src}"></script>'
 
 
 def main() -> int:
@@ -52,10 +150,14 @@ def main() -> int:
     parser.add_argument("--footer-template", type=str, default="_footer_includes.html", help="Footer partial filename")
     parser.add_argument("--no-download", action="store_true", help="Do not download assets, keep remote URLs")
     args = parser.parse_args()
+    # Bound once so the per-tag loop below reads a local instead of the argparse namespace
+    base_url = args.url
+    assets_dir = args.assets_dir
+    no_download = args.no_download
 
-    resp = requests.get(args.url, timeout=30)
+    resp = _SESSION.get(args.url, timeout=30)
     resp.raise_for_status()
-    soup = BeautifulSoup(resp.text, "html.parser")
+    soup = BeautifulSoup(resp.content, "lxml")
 
     head = soup.find("head") or soup
     body = soup.find("body") or soup
@@ -65,20 +167,24 @@ def main() -> int:
     head_scripts = head.find_all("script", src=True)
     body_scripts = body.find_all("script", src=True)
 
+    # Validators from the previous run; assets listed here are revalidated with a conditional GET
+    http_cache_path = args.assets_dir / HTTP_CACHE_FILENAME
+    http_cache = {url: meta for url, meta in load_cache(http_cache_path).items() if isinstance(meta, dict)}
+
     downloaded_map = {}  # remote_url -> local_relative
 
     def mirror_src_or_href(tag, attr: str) -> str:
         url = tag.get(attr) or ""
         if not url:
             return ""
-        full = urljoin(args.url, url)
-        if args.no-download:
+        full = urljoin(base_url, url)
+        if no_download:
             return full
         name = safe_name_from_url(full)
         local_rel = f"assets/{name}"
-        local_path = args.assets_dir / name
+        local_path = assets_dir / name
         if full not in downloaded_map:
-            if download(full, local_path):
+            if download(full, local_path, http_cache):
                 downloaded_map[full] = local_rel
             else:
                 downloaded_map[full] = full  # fallback to remote
@@ -96,15 +202,7 @@ def main() -> int:
             # use Jinja base_path prefix for local
             if href.startswith("assets/"):
                 href = "{{ base_path }}" + href
-            # replicate important attributes
-            attrs = []
-            for k in ("rel", "as", "type", "crossorigin", "media", "integrity", "referrerpolicy"):
-                v = ln.get(k)
-                if v:
-                    if isinstance(v, list):
-                        v = " ".join(v)
-                    attrs.append(f'{k}="{v}"')
-            attrs_str = " ".join(attrs) if attrs else 'rel="stylesheet"'
+            attrs_str = link_attrs(ln) or 'rel="stylesheet"'
             head_lines.append(f'<link {attrs_str} href="{href}">')
 
     for sc in head_scripts:
@@ -113,19 +211,7 @@ def main() -> int:
             continue
         if src.startswith("assets/"):
             src = "{{ base_path }}" + src
-        attrs = []
-        for k in ("type", "crossorigin", "defer", "async", "integrity", "referrerpolicy"):
-            if sc.has_attr(k):
-                v = sc.get(k)
-                if v is True or v is None:
-                    attrs.append(k)
-                else:
-                    attrs.append(f'{k}="{v}"')
-        attrs_str = " ".join(attrs) if attrs else ""
-        if attrs_str:
-            head_lines.append(f'<script src="{src}" {attrs_str}></script>')
-        else:
-            head_lines.append(f'<script src="{src}"></script>')
+        head_lines.append(script_tag(sc, src))
 
     # Build footer partial from body scripts
     footer_lines: list[str] = []
@@ -135,29 +221,20 @@ def main() -> int:
             continue
         if src.startswith("assets/"):
             src = "{{ base_path }}" + src
-        attrs = []
-        for k in ("type", "crossorigin", "defer", "async", "integrity", "referrerpolicy"):
-            if sc.has_attr(k):
-                v = sc.get(k)
-                if v is True or v is None:
-                    attrs.append(k)
-                else:
-                    attrs.append(f'{k}="{v}"')
-        attrs_str = " ".join(attrs) if attrs else ""
-        if attrs_str:
-            footer_lines.append(f'<script src="{src}" {attrs_str}></script>')
-        else:
-            footer_lines.append(f'<script src="{src}"></script>')
+        footer_lines.append(script_tag(sc, src))
 
     # Write partials
     ensure_dir(args.templates_dir)
     (args.templates_dir / args.head_template).write_text("\n".join(head_lines) + ("\n" if head_lines else ""), encoding="utf-8")
     (args.templates_dir / args.footer_template).write_text("\n".join(footer_lines) + ("\n" if footer_lines else ""), encoding="utf-8")
 
+    if not no_download:
+        save_cache(http_cache_path, http_cache)
+
     print("Theme partials written:")
     print(f"  {args.templates_dir / args.head_template}")
     print(f"  {args.templates_dir / args.footer_template}")
-    if not args.no-download:
+    if not no_download:
         print(f"Assets downloaded to: {args.assets_dir.resolve()}")
     return 0
 
@@ -18,14 +18,18 @@ import os
 import re
 import shutil
 import sys
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from dataclasses import dataclass, field
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 from urllib.parse import urlparse
-import xml.etree.ElementTree as ET
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from jinja2 import Environment, FileSystemLoader, select_autoescape
+from lxml import etree
 
 
 WXR_NS = {
@@ -34,7 +38,34 @@ WXR_NS = {
     "wp": "http://wordpress.org/export/1.2/",
 }
 
+# Clark-notation tag names, resolved once instead of per findtext() call
+_T_POSTTYPE = f"{{{WXR_NS['wp']}}}post_type"
+_T_STATUS = f"{{{WXR_NS['wp']}}}status"
+_T_POSTID = f"{{{WXR_NS['wp']}}}post_id"
+_T_POSTNAME = f"{{{WXR_NS['wp']}}}post_name"
+_T_CONTENT = f"{{{WXR_NS['content']}}}encoded"
+_T_POSTDATE = f"{{{WXR_NS['wp']}}}post_date"
+_T_PARENT = f"{{{WXR_NS['wp']}}}post_parent"
+_T_MENUORDER = f"{{{WXR_NS['wp']}}}menu_order"
+
+
+def _build_session() -> requests.Session:
+    # Shared across every page/post so media from the same host reuses pooled connections
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=16,
+        pool_maxsize=32,
+        max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504]),
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+_SESSION = _build_session()
 
+
+@lru_cache(maxsize=4096)
 def slugify(value: str) -> str:
     value = value.strip().lower()
     # Decode HTML entities just in case
@@ -49,6 +80,12 @@ def ensure_dir(path: Path) -> None:
     path.mkdir(parents=True, exist_ok=True)
 
 
+def ensure_dirs(paths: Iterable[Path]) -> None:
+    # Create each distinct directory once, shallowest first
+    for path in sorted(set(paths), key=lambda p: len(p.parts)):
+        ensure_dir(path)
+
+
 @dataclass
 class ContentItem:
     post_id: int
@@ -63,79 +100,103 @@ class ContentItem:
     categories: List[str] = field(default_factory=list)
 
 
-def parse_wxr(input_xml: Path) -> Tuple[str, Dict[int, ContentItem]]:
-    tree = ET.parse(str(input_xml))
-    root = tree.getroot()
+def _parse_item(item: etree._Element) -> Optional[ContentItem]:
+    post_type = item.findtext(_T_POSTTYPE, default="") or ""
+    post_status = item.findtext(_T_STATUS, default="") or ""
+    if post_type not in {"page", "post"}:
+        # Skip attachments, nav_menu_item, etc.
+        return None
 
-    channel = root.find("channel")
-    if channel is None:
-        raise RuntimeError("Invalid WXR: missing <channel>")
+    post_id_text = item.findtext(_T_POSTID, default="") or "0"
+    try:
+        post_id = int(post_id_text)
+    except ValueError:
+        return None
 
-    site_title = (channel.findtext("title") or "").strip()
+    raw_title = item.findtext("title") or ""
+    raw_slug = item.findtext(_T_POSTNAME, default="") or ""
+    raw_content = item.findtext(_T_CONTENT, default="") or ""
+    raw_date = item.findtext(_T_POSTDATE, default="") or ""
+    raw_parent = item.findtext(_T_PARENT, default="") or "0"
+    raw_menu_order = item.findtext(_T_MENUORDER, default="0") or "0"
 
-    items: Dict[int, ContentItem] = {}
-    for item in channel.findall("item"):
-        post_type = item.findtext("wp:post_type", default="", namespaces=WXR_NS) or ""
-        post_status = item.findtext("wp:status", default="", namespaces=WXR_NS) or ""
-        if post_type not in {"page", "post"}:
-            # Skip attachments, nav_menu_item, etc.
-            continue
+    try:
+        parent_id = int(raw_parent)
+    except ValueError:
+        parent_id = 0
+    parent_id = parent_id if parent_id > 0 else None
 
-        post_id_text = item.findtext("wp:post_id", default="", namespaces=WXR_NS) or "0"
+    try:
+        menu_order = int(raw_menu_order)
+    except ValueError:
+        menu_order = 0
+
+    parsed_date: Optional[dt.datetime] = None
+    raw_date = (raw_date or "").strip()
+    if raw_date:
         try:
-            post_id = int(post_id_text)
-        except ValueError:
-            continue
+            parsed_date = dt.datetime.fromisoformat(raw_date)
+        except Exception:
+            parsed_date = None
+
+    categories: List[str] = []
+    for cat in item.findall("category"):
+        term = (cat.text or "").strip()
+        if term:
+            categories.append(term)
+
+    title = raw_title.strip() or f"{post_type.title()} {post_id}"
+    slug = (raw_slug.strip() or slugify(title)) or f"{post_type}-{post_id}"
+
+    return ContentItem(
+        post_id=post_id,
+        post_type=post_type,
+        status=post_status,
+        title=title,
+        slug=slug,
+        content_html=raw_content,
+        date=parsed_date,
+        parent_id=parent_id,
+        menu_order=menu_order,
+        categories=categories,
+    )
 
-        raw_title = item.findtext("title") or ""
-        raw_slug = item.findtext("wp:post_name", default="", namespaces=WXR_NS) or ""
-        raw_content = item.findtext("content:encoded", default="", namespaces=WXR_NS) or ""
-        raw_date = item.findtext("wp:post_date", default="", namespaces=WXR_NS) or ""
-        raw_parent = item.findtext("wp:post_parent", default="", namespaces=WXR_NS) or "0"
-        raw_menu_order = item.findtext("wp:menu_order", default="0", namespaces=WXR_NS) or "0"
 
-        try:
-            parent_id = int(raw_parent)
-        except ValueError:
-            parent_id = 0
-        parent_id = parent_id if parent_id > 0 else None
+def parse_wxr(input_xml: Path) -> Tuple[str, Dict[int, ContentItem]]:
+    site_title: Optional[str] = None
+    has_channel = False
+    items: Dict[int, ContentItem] = {}
 
-        try:
-            menu_order = int(raw_menu_order)
-        except ValueError:
-            menu_order = 0
-
-        parsed_date: Optional[dt.datetime] = None
-        raw_date = (raw_date or "").strip()
-        if raw_date:
-            try:
-                parsed_date = dt.datetime.fromisoformat(raw_date)
-            except Exception:
-                parsed_date = None
-
-        categories: List[str] = []
-        for cat in item.findall("category"):
-            term = (cat.text or "").strip()
-            if term:
-                categories.append(term)
-
-        title = raw_title.strip() or f"{post_type.title()} {post_id}"
-        slug = (raw_slug.strip() or slugify(title)) or f"{post_type}-{post_id}"
-
-        items[post_id] = ContentItem(
-            post_id=post_id,
-            post_type=post_type,
-            status=post_status,
-            title=title,
-            slug=slug,
-            content_html=raw_content,
-            date=parsed_date,
-            parent_id=parent_id,
-            menu_order=menu_order,
-            categories=categories,
-        )
+    # Stream the export: each <item> is parsed on its end event and then freed, so memory stays flat
+    for _, elem in etree.iterparse(
+        str(input_xml),
+        events=("end",),
+        tag=("channel", "title", "item"),
+        resolve_entities="internal",
+        no_network=True,
+        # Posts with inline base64 images exceed libxml2's default 10 MB text-node limit
+        huge_tree=True,
+    ):
+        parent = elem.getparent()
+        if elem.tag == "channel":
+            has_channel = has_channel or (parent is not None and parent.getparent() is None)
+        elif parent is None or parent.tag != "channel":
+            continue
+        elif elem.tag == "title":
+            if site_title is None:
+                site_title = (elem.text or "").strip()
+        else:
+            content_item = _parse_item(elem)
+            if content_item is not None:
+                items[content_item.post_id] = content_item
+            elem.clear(keep_tail=True)
+            while elem.getprevious() is not None:
+                del parent[0]
+
+    if not has_channel:
+        raise RuntimeError("Invalid WXR: missing <channel>")
 
-    return site_title, items
+    return site_title or "", items
 
 
 def build_hierarchy(items: Dict[int, ContentItem]) -> Tuple[List[ContentItem], List[ContentItem], Dict[int, List[int]]]:
@@ -148,20 +209,24 @@ def build_hierarchy(items: Dict[int, ContentItem]) -> Tuple[List[ContentItem], L
         parent = page.parent_id or 0
         children_by_parent.setdefault(parent, []).append(page.post_id)
 
-    # Order page children by menu_order then title
-    for pid, lst in children_by_parent.items():
-        lst.sort(key=lambda cid: (items[cid].menu_order, items[cid].title.lower()))
+    # Order page children by menu_order then title; keys are built once per page, not per sibling list
+    sort_key = {page.post_id: (page.menu_order, page.title.casefold()) for page in pages}
+    for lst in children_by_parent.values():
+        lst.sort(key=sort_key.__getitem__)
 
     posts.sort(key=lambda p: (p.date or dt.datetime.min), reverse=True)
     return pages, posts, children_by_parent
 
 
+_MAX_ANCESTORS = 64  # guards against parent cycles in malformed exports
+
+
 def compute_page_path(page: ContentItem, items: Dict[int, ContentItem]) -> Tuple[List[str], str]:
     # Build segments from ancestors -> current
     segments: List[str] = [page.slug]
     cursor = page
     chain_guard = 0
-    while cursor.parent_id and chain_guard < 64:
+    while cursor.parent_id and chain_guard < _MAX_ANCESTORS:
         parent = items.get(cursor.parent_id)
         if not parent:
             break
@@ -174,6 +239,41 @@ def compute_page_path(page: ContentItem, items: Dict[int, ContentItem]) -> Tuple
     return segments, url_path
 
 
+def all_page_paths(pages: List[ContentItem], items: Dict[int, ContentItem]) -> Dict[int, Tuple[List[str], str]]:
+    # Each page extends its parent's memoized segments, so shared ancestor chains are walked once
+    max_segments = _MAX_ANCESTORS + 1
+    segments_by_id: Dict[int, Tuple[str, ...]] = {}
+
+    def segments_for(page: ContentItem) -> Optional[Tuple[str, ...]]:
+        chain: List[ContentItem] = []
+        cursor = page
+        segments: Tuple[str, ...] = ()
+        while cursor.post_id not in segments_by_id:
+            chain.append(cursor)
+            if len(chain) > max_segments:
+                return None  # cycle or over-deep chain
+            parent = items.get(cursor.parent_id) if cursor.parent_id else None
+            if parent is None:
+                break
+            cursor = parent
+        else:
+            segments = segments_by_id[cursor.post_id]
+        for node in reversed(chain):
+            segments = segments + (node.slug,)
+            segments_by_id[node.post_id] = segments
+        return segments
+
+    paths: Dict[int, Tuple[List[str], str]] = {}
+    for page in pages:
+        segments = segments_for(page)
+        if segments is None or len(segments) > max_segments:
+            # Let the capped ancestor walk decide how these pathological chains are truncated
+            paths[page.post_id] = compute_page_path(page, items)
+        else:
+            paths[page.post_id] = (list(segments), "/".join(segments) + "/index.html")
+    return paths
+
+
 def base_path_for_output(url_path: str) -> str:
     # "about/team/index.html" -> "../../"
     depth = url_path.count("/") - 1  # count folders
@@ -183,61 +283,175 @@ def base_path_for_output(url_path: str) -> str:
 
 
 _SRC_HREF_RE = re.compile(r"""(?P<attr>\s(?:src|href))=(?P<q>['"])(?P<url>.*?)(?P=q)""", re.IGNORECASE)
+_TAG_STRIP_RE = re.compile(r"<[^>]+>")
 
 
-def rewrite_and_download_assets(
-    html_content: str,
-    assets_dir: Path,
-    should_download: bool,
-) -> Tuple[str, List[str]]:
-    downloaded: List[str] = []
+DOWNLOAD_WORKERS = 8
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
 
-    def replace(m: re.Match) -> str:
-        attr = m.group("attr")
-        quoted = m.group("q")
+
+@lru_cache(maxsize=4096)
+def _local_asset_name(url: str) -> Optional[str]:
+    # Returns the file name under assets/ for a remote http(s) URL, or None if it is not downloadable
+    if not url or url.startswith(("data:", "mailto:", "tel:", "#")):
+        return None
+    parsed = urlparse(url)
+    if parsed.scheme in {"http", "https"} and parsed.netloc and parsed.path:
+        filename = Path(parsed.path).name or "asset"
+        return slugify(Path(filename).stem) + Path(filename).suffix.lower()
+    return None
+
+
+def _fetch_asset(url: str, local_path: Path) -> None:
+    # Stream to a .part file so large media never sits fully in memory or lands half-written
+    part = local_path.with_name(local_path.name + ".part")
+    try:
+        with _SESSION.get(url, stream=True, timeout=20) as resp:
+            resp.raise_for_status()
+            with open(part, "wb") as fh:
+                for chunk in resp.iter_content(DOWNLOAD_CHUNK_SIZE):
+                    fh.write(chunk)
+        part.replace(local_path)
+    finally:
+        part.unlink(missing_ok=True)
+
+
+def collect_asset_urls(html_content: str) -> Dict[str, str]:
+    # Map each downloadable src/href URL to the file name it gets under assets/
+    names_by_url: Dict[str, str] = {}
+    for m in _SRC_HREF_RE.finditer(html_content):
         url = (m.group("url") or "").strip()
-        if not url or url.startswith(("data:", "mailto:", "tel:", "#")):
-            return m.group(0)
+        name = _local_asset_name(url)
+        if name:
+            names_by_url.setdefault(url, name)
+    return names_by_url
 
-        parsed = urlparse(url)
-        if parsed.scheme in {"http", "https"} and parsed.netloc and parsed.path:
-            filename = Path(parsed.path).name or "asset"
-            safe_name = slugify(Path(filename).stem) + Path(filename).suffix.lower()
-            local_rel = f"assets/{safe_name}"
-            local_path = assets_dir / safe_name
 
-            if should_download and not local_path.exists():
+def download_assets(
+    names_by_url: Dict[str, str],
+    assets_dir: Path,
+    max_workers: int = DOWNLOAD_WORKERS,
+) -> Tuple[Dict[str, str], List[str]]:
+    # Returns (url -> local name for every asset present on disk, urls downloaded by this call)
+    downloaded: List[str] = []
+    available = {name for name in set(names_by_url.values()) if (assets_dir / name).exists()}
+    pending: Dict[str, str] = {}  # local name -> url, one download per target file
+    for url, name in names_by_url.items():
+        if name not in available:
+            pending.setdefault(name, url)
+
+    if pending:
+        ensure_dir(assets_dir)
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            futures = {
+                pool.submit(_fetch_asset, url, assets_dir / name): (name, url)
+                for name, url in pending.items()
+            }
+            for future in as_completed(futures):
+                name, url = futures[future]
                 try:
-                    resp = requests.get(url, timeout=20)
-                    resp.raise_for_status()
-                    ensure_dir(assets_dir)
-                    local_path.write_bytes(resp.content)
-                    downloaded.append(url)
+                    future.result()
                 except Exception:
                     # If download fails, keep original URL
-                    return m.group(0)
+                    continue
+                available.add(name)
+                downloaded.append(url)
+
+    local_by_url = {url: name for url, name in names_by_url.items() if name in available}
+    return local_by_url, downloaded
+
+
+def rewrite_asset_urls(html_content: str, local_by_url: Dict[str, str]) -> str:
+    if not local_by_url:
+        return html_content
+
+    def replace(m: re.Match) -> str:
+        name = local_by_url.get((m.group("url") or "").strip())
+        if name is None:
+            return m.group(0)
+        return f'{m.group("attr")}={m.group("q")}assets/{name}{m.group("q")}'
+
+    return _SRC_HREF_RE.sub(replace, html_content)
+
 
-            # Rewrite to local asset path regardless if we downloaded (only when should_download is True)
-            if should_download:
-                return f'{attr}={quoted}{local_rel}{quoted}'
-            else:
-                return m.group(0)
-        return m.group(0)
+COPY_WORKERS = 8
 
-    new_html = _SRC_HREF_RE.sub(replace, html_content)
-    return new_html, downloaded
+
+def _iter_files(root: Path) -> Iterator[Path]:
+    # Symlinked directories are skipped as glob("**/*") did, so a link loop under static/ cannot recurse forever
+    with os.scandir(root) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                yield from _iter_files(Path(entry.path))
+            elif entry.is_file():
+                yield Path(entry.path)
 
 
 def copy_static(output_dir: Path, repo_root: Path) -> None:
     src_static = repo_root / "static"
     dst_static = output_dir / "static"
     ensure_dir(dst_static)
-    for item in src_static.glob("**/*"):
-        if item.is_file():
-            rel = item.relative_to(src_static)
-            target = dst_static / rel
-            ensure_dir(target.parent)
-            shutil.copy2(item, target)
+    if not src_static.is_dir():
+        return
+
+    jobs = [(item, dst_static / item.relative_to(src_static)) for item in _iter_files(src_static)]
+    ensure_dirs(target.parent for _, target in jobs)
+    # Copies are I/O bound and release the GIL; copyfile skips the copystat() that copy2 adds
+    with ThreadPoolExecutor(max_workers=COPY_WORKERS) as pool:
+        list(pool.map(lambda job: shutil.copyfile(*job), jobs))
+
+
+# A spawned worker costs ~0.35 s to start while one render takes ~0.2-0.35 ms, so the pool
+# only pays off once a site has a couple of thousand pages and posts
+PARALLEL_RENDER_MIN_JOBS = 2000
+RENDER_CHUNKSIZE = 8
+
+RenderJob = Tuple[str, Dict[str, object], Path]  # (template name, context, output file)
+
+_WORKER_ENV: Optional[Environment] = None
+
+
+def make_environment(template_dir: Path) -> Environment:
+    return Environment(
+        loader=FileSystemLoader(str(template_dir)),
+        autoescape=select_autoescape(["html"]),
+        trim_blocks=True,
+        lstrip_blocks=True,
+        # Templates do not change during a build: keep every compiled template and skip mtime checks
+        auto_reload=False,
+        cache_size=-1,
+    )
+
+
+def _render_to_file(env: Environment, tpl_name: str, context: Dict[str, object], out_file: Path) -> None:
+    env.get_template(tpl_name).stream(**context).dump(str(out_file), encoding="utf-8")
+
+
+def _init_render_worker(template_dir: Path) -> None:
+    # Each worker process compiles the templates once and reuses them for every job it receives
+    global _WORKER_ENV
+    _WORKER_ENV = make_environment(template_dir)
+
+
+def _render_one(job: RenderJob) -> None:
+    assert _WORKER_ENV is not None
+    _render_to_file(_WORKER_ENV, *job)
+
+
+def render_jobs(jobs: List[RenderJob], env: Environment, template_dir: Path) -> None:
+    # Jinja rendering is GIL-bound, so very large sites fan out to processes on multi-core machines
+    cpus = os.cpu_count() or 1
+    workers = min(cpus, len(jobs) // RENDER_CHUNKSIZE)
+    if cpus <= 1 or workers <= 1 or len(jobs) < PARALLEL_RENDER_MIN_JOBS:
+        for job in jobs:
+            _render_to_file(env, *job)
+        return
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_render_worker,
+        initargs=(template_dir,),
+    ) as pool:
+        list(pool.map(_render_one, jobs, chunksize=RENDER_CHUNKSIZE))
 
 
 def render_site(
@@ -249,15 +463,7 @@ def render_site(
     repo_root = Path(__file__).resolve().parents[1]
     template_dir = repo_root / "templates"
 
-    env = Environment(
-        loader=FileSystemLoader(str(template_dir)),
-        autoescape=select_autoescape(["html"]),
-        trim_blocks=True,
-        lstrip_blocks=True,
-    )
-    page_tpl = env.get_template("page.html")
-    post_tpl = env.get_template("post.html")
-    base_tpl = env.get_template("base.html")  # for index rendering via include
+    env = make_environment(template_dir)
 
     # Detect optional theme includes generated by mirror script
     theme_head_path = template_dir / "_head_includes.html"
@@ -272,6 +478,7 @@ def render_site(
 
     site_title_from_wxr, items = parse_wxr(input_xml)
     pages, posts, children_by_parent = build_hierarchy(items)
+    page_paths = all_page_paths(pages, items)
 
     site_title = site_title_override or site_title_from_wxr or "Website"
 
@@ -280,7 +487,7 @@ def render_site(
     nav_pages: List[Dict[str, str]] = []
     for pid in top_level_ids:
         pg = items[pid]
-        _, url_path = compute_page_path(pg, items)
+        _, url_path = page_paths[pid]
         nav_pages.append({"title": pg.title, "url_path": url_path})
 
     # Prepare output
@@ -288,19 +495,32 @@ def render_site(
     copy_static(output_dir, repo_root)
     assets_dir = output_dir / "assets"
 
+    # Fetch media for the whole site in one batch so rendering only rewrites URLs
+    local_by_url: Dict[str, str] = {}
+    if download_media:
+        names_by_url: Dict[str, str] = {}
+        for item in pages + posts:
+            for url, name in collect_asset_urls(item.content_html or "").items():
+                names_by_url.setdefault(url, name)
+        local_by_url, _ = download_assets(names_by_url, assets_dir)
+
+    # WordPress bodies often repeat verbatim (shared blocks, empty pages), so rewrite each distinct body once
+    @lru_cache(maxsize=1024)
+    def rewrite_body(content_html: str) -> str:
+        return rewrite_asset_urls(content_html, local_by_url)
+
     current_year = dt.datetime.now().year
+    jobs: List[RenderJob] = []
 
-    # Render pages
+    # Queue page renders
     for page in pages:
-        segments, url_path = compute_page_path(page, items)
+        segments, url_path = page_paths[page.post_id]
         out_file = output_dir / url_path
-        ensure_dir(out_file.parent)
         base_path = base_path_for_output(url_path)
 
-        body_html = page.content_html or ""
-        body_html, _ = rewrite_and_download_assets(body_html, assets_dir, download_media)
+        body_html = rewrite_body(page.content_html or "")
 
-        html_out = page_tpl.render(
+        context: Dict[str, object] = dict(
             page_title=page.title,
             site_title=site_title,
             nav_pages=nav_pages,
@@ -311,24 +531,21 @@ def render_site(
             title=page.title,
             body=body_html,
         )
-        out_file.write_text(html_out, encoding="utf-8")
+        jobs.append(("page.html", context, out_file))
 
-    # Render posts
+    # Queue post renders
     blog_dir = output_dir / "blog"
-    ensure_dir(blog_dir)
     for post in posts:
         url_path = f"blog/{post.slug}/index.html"
         out_file = output_dir / url_path
-        ensure_dir(out_file.parent)
         base_path = base_path_for_output(url_path)
 
         date_iso = post.date.isoformat() if post.date else ""
         date_human = post.date.strftime("%b %d, %Y") if post.date else ""
 
-        body_html = post.content_html or ""
-        body_html, _ = rewrite_and_download_assets(body_html, assets_dir, download_media)
+        body_html = rewrite_body(post.content_html or "")
 
-        html_out = post_tpl.render(
+        context = dict(
             page_title=post.title,
             site_title=site_title,
             nav_pages=nav_pages,
@@ -342,11 +559,13 @@ def render_site(
             date_human=date_human,
             categories=post.categories,
         )
-        out_file.write_text(html_out, encoding="utf-8")
+        jobs.append(("post.html", context, out_file))
+
+    ensure_dirs([blog_dir, *(out_file.parent for _, _, out_file in jobs)])
+    render_jobs(jobs, env, template_dir)
 
     # Render blog index
-    blog_index = output_dir / "blog" / "index.html"
-    ensure_dir(blog_index.parent)
+    blog_index = blog_dir / "index.html"
     blog_cards = []
     for post in posts:
         date_human = post.date.strftime("%b %d, %Y") if post.date else ""
@@ -358,50 +577,32 @@ def render_site(
             }
         )
     base_path = base_path_for_output("blog/index.html")
-    blog_html = env.from_string(
-        """{% set content %}
-<section>
-  <h1>Blog</h1>
-  {% if posts|length == 0 %}
-    <p>No posts yet.</p>
-  {% else %}
-  <ul class="index-list">
-    {% for p in posts %}
-      <li class="index-card">
-        <a href="{{ base_path }}{{ p.href }}">
-          <h3>{{ p.title }}</h3>
-          {% if p.subtitle %}<p>{{ p.subtitle }}</p>{% endif %}
-        </a>
-      </li>
-    {% endfor %}
-  </ul>
-  {% endif %}
-</section>
-{% endset %}
-{% include "base.html" with context %}
-"""
-    ).render(
-        page_title="Blog",
-        site_title=site_title,
-        nav_pages=nav_pages,
-        base_path=base_path,
-        current_year=current_year,
-        theme_head=has_theme_head,
-        theme_footer=has_theme_footer,
-        posts=blog_cards,
+    _render_to_file(
+        env,
+        "_blog_index.html",
+        dict(
+            page_title="Blog",
+            site_title=site_title,
+            nav_pages=nav_pages,
+            base_path=base_path,
+            current_year=current_year,
+            theme_head=has_theme_head,
+            theme_footer=has_theme_footer,
+            posts=blog_cards,
+        ),
+        blog_index,
     )
-    blog_index.write_text(blog_html, encoding="utf-8")
 
     # Render site index
     home_cards = []
     for pid in children_by_parent.get(0, []):
         pg = items[pid]
-        _, page_url = compute_page_path(pg, items)
+        _, page_url = page_paths[pid]
         subtitle = ""
         if pg.content_html:
             # take first 140 characters without tags as preview
-            text = re.sub(r"<[^>]+>", "", pg.content_html or "")
-            subtitle = (text.strip()[:140] + "…") if len(text.strip()) > 140 else text.strip()
+            text = _TAG_STRIP_RE.sub("", pg.content_html).strip()
+            subtitle = (text[:140] + "…") if len(text) > 140 else text
         home_cards.append({"title": pg.title, "href": page_url, "subtitle": subtitle})
 
     latest_posts = []
@@ -411,55 +612,22 @@ def render_site(
             {"title": post.title, "href": f"blog/{post.slug}/index.html", "subtitle": date_human}
         )
 
-    home_html = env.from_string(
-        """{% set content %}
-<section>
-  <h1>Welcome</h1>
-  {% if pages|length > 0 %}
-  <h2>Pages</h2>
-  <ul class="index-list">
-    {% for p in pages %}
-      <li class="index-card">
-        <a href="{{ p.href }}">
-          <h3>{{ p.title }}</h3>
-          {% if p.subtitle %}<p>{{ p.subtitle }}</p>{% endif %}
-        </a>
-      </li>
-    {% endfor %}
-  </ul>
-  {% endif %}
-
-  <h2>Latest posts</h2>
-  {% if posts|length == 0 %}
-    <p>No posts yet.</p>
-  {% else %}
-  <ul class="index-list">
-    {% for p in posts %}
-      <li class="index-card">
-        <a href="blog/{{ p.href.split('blog/', 1)[1] }}">
-          <h3>{{ p.title }}</h3>
-          {% if p.subtitle %}<p>{{ p.subtitle }}</p>{% endif %}
-        </a>
-      </li>
-    {% endfor %}
-  </ul>
-  {% endif %}
-</section>
-{% endset %}
-{% include "base.html" with context %}
-"""
-    ).render(
-        page_title="Home",
-        site_title=site_title,
-        nav_pages=nav_pages,
-        base_path="",
-        current_year=current_year,
-        theme_head=has_theme_head,
-        theme_footer=has_theme_footer,
-        pages=home_cards,
-        posts=latest_posts,
+    _render_to_file(
+        env,
+        "_home_index.html",
+        dict(
+            page_title="Home",
+            site_title=site_title,
+            nav_pages=nav_pages,
+            base_path="",
+            current_year=current_year,
+            theme_head=has_theme_head,
+            theme_footer=has_theme_footer,
+            pages=home_cards,
+            posts=latest_posts,
+        ),
+        output_dir / "index.html",
     )
-    (output_dir / "index.html").write_text(home_html, encoding="utf-8")
 
 
 def main(argv: Optional[List[str]] = None) -> int: